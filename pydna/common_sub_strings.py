@@ -13,6 +13,8 @@ from operator import itemgetter    as _itemgetter
 
 '''
 
+_length = _itemgetter(2)
+
 def common_sub_strings(stringx, stringy, limit=25):
     '''
     common_sub_strings(stringx , stringy , limit=25)
@@ -60,7 +62,7 @@ def common_sub_strings(stringx, stringy, limit=25):
 
     match.sort()
 
-    match.sort(key=_itemgetter(2), reverse=True)
+    match.sort(key=_length, reverse=True)
 
     return match
 
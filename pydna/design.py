@@ -13,7 +13,6 @@ This module contain functions for primer design.
 #import warnings
 
 import math                                       as _math
-#from operator import itemgetter                   as _itemgetter
 import os                                         as _os
 import copy                                       as _copy
 #from Bio.Alphabet import Alphabet                 as _Alphabet
@@ -25,10 +24,26 @@ from pydna.tm import tmbresluc                    as _tmbresluc
 from pydna.dseqrecord import Dseqrecord           as _Dseqrecord
 #from pydna._pretty import pretty_str              as _pretty_str
 from pydna.primer    import Primer                as _Primer
+from pydna.utils     import rc                    as _rc
 
 import logging    as _logging
 _module_logger = _logging.getLogger("pydna."+__name__)
 
+# placeholder for linkers that have been moved into primer tails by assembly_fragments
+_empty = _Dseqrecord("")
+
+def _footprint(primer, template, limit):
+    '''Returns the longest 3' part of the primer string, at least limit long, found in
+    the upper case template string. None is returned if there is no such part or if the
+    primer contains ambiguous nucleotides.'''
+    p = primer.upper()
+    if p.strip("ACGT"):
+        return None
+    for length in range(len(p), limit-1, -1):
+        if p[-length:] in template:
+            return primer[-length:]
+    return None
+
 def primer_design(    template,
                       fp=None,
                       rp=None,
@@ -147,36 +162,46 @@ def primer_design(    template,
 
     '''
     
-    def design(target_tm, template):
+    def design(target_tm, s):
         ''' returns a string '''
-        tmp=0
-        length=limit
-        p = str(template.seq[:length])
-        while tmp<target_tm:
+        u = s.upper()
+        maxlength = len(u)
+        # ps is the prefix tested one step before p, so its tm is kept from the previous step
+        length=limit+1
+        tmps, tmp = formula(u[:limit]), formula(u[:length])
+        while tmp<target_tm and length<maxlength:
             length+=1
-            p = str(template.seq[:length])
-            tmp = formula(p.upper())
-        ps = p[:-1]
-        tmps = formula(str(ps).upper())
+            tmps, tmp = tmp, formula(u[:length])
+        p, ps = s[:length], s[:length-1]
         _module_logger.debug(((p,   tmp),(ps, tmps)))
-        return min( ( abs(target_tm-tmp), p), (abs(target_tm-tmps), ps) )[1]
+        return p if abs(target_tm-tmp) < abs(target_tm-tmps) else ps
     
+    tseq = str(template.seq)
+    if len(tseq) <= limit:
+        raise ValueError("The template ({} bp) has to be longer than limit ({} bp).".format(len(tseq), limit))
+    rcseq = _rc(tseq)
+
     if fp and not rp:
-        fp  = _Anneal((fp,), template).forward_primers.pop()
-        target_tm = formula( str(fp.footprint), primerc=fprimerc, saltc=saltc)
+        footprint = _footprint(str(fp.seq), (tseq if template.linear else tseq+tseq).upper(), limit)
+        if footprint is None:
+            footprint = _Anneal((fp,), template, limit=limit).forward_primers.pop().footprint
+        target_tm = formula( str(footprint), primerc=fprimerc, saltc=saltc)
         _module_logger.debug("forward primer given, design reverse primer:")
-        rp = _Primer(design(target_tm, template.rc()))
+        rp = _Primer(design(target_tm, rcseq))
     elif not fp and rp:
-        rp =  _Anneal([rp], template).reverse_primers.pop()
-        target_tm = formula( str(rp.footprint), primerc=rprimerc, saltc=saltc)
+        footprint = _footprint(str(rp.seq), (rcseq if template.linear else rcseq+rcseq).upper(), limit)
+        if footprint is None:
+            footprint = _Anneal([rp], template, limit=limit).reverse_primers.pop().footprint
+        target_tm = formula( str(footprint), primerc=rprimerc, saltc=saltc)
         _module_logger.debug("reverse primer given, design forward primer:")
-        fp = _Primer(design(target_tm, template))
+        fp = _Primer(design(target_tm, tseq))
     elif not fp and not rp:
         _module_logger.debug("no primer given, design forward primer:")
-        fp = _Primer((design(target_tm, template)))
-        target_tm = formula( str(fp.seq), primerc=fprimerc, saltc=saltc)
+        fwd = design(target_tm, tseq)
+        fp = _Primer(fwd)
+        target_tm = formula( fwd, primerc=fprimerc, saltc=saltc)
         _module_logger.debug("no primer given, design reverse primer:")
-        rp = _Primer(design(target_tm, template.rc()))
+        rp = _Primer(design(target_tm, rcseq))
     else:
         raise Exception("Specify maximum one of the two primers.")
 
@@ -187,20 +212,24 @@ def primer_design(    template,
     prod.forward_primer.concentration = fprimerc
     prod.reverse_primer.concentration = rprimerc
 
+    fwid = "fw{}".format(len(tseq))
+    rvid = "rv{}".format(len(tseq))
+    accession = template.accession
+
     if prod.forward_primer.id == "<unknown id>":
-        prod.forward_primer.id = "fw{}".format(len(template))
+        prod.forward_primer.id = fwid
         
     if prod.reverse_primer.id == "<unknown id>":
-        prod.reverse_primer.id = "rv{}".format(len(template))
+        prod.reverse_primer.id = rvid
 
     if prod.forward_primer.name == "<unknown name>":
-        prod.forward_primer.name = "fw{}".format(len(template))
+        prod.forward_primer.name = fwid
         
     if prod.reverse_primer.name == "<unknown name>":
-        prod.reverse_primer.name = "rv{}".format(len(template))
+        prod.reverse_primer.name = rvid
 
-    prod.forward_primer.description = prod.forward_primer.id+' '+template.accession
-    prod.reverse_primer.description = prod.reverse_primer.id+' '+template.accession
+    prod.forward_primer.description = prod.forward_primer.id+' '+accession
+    prod.reverse_primer.description = prod.reverse_primer.id+' '+accession
 
     return prod
 
@@ -606,72 +635,77 @@ def assembly_fragments(f, overlap=35, maxlink=40):
         _module_logger.debug("first fragment stays since len(f[0]) = %s", first_fragment_length)
 
     if last_fragment_length<=maxlink:
-        f[-2].reverse_primer = f[-1].seq.rc().todata + f[-2].reverse_primer
+        f[-2].reverse_primer = _rc(f[-1].seq.todata) + f[-2].reverse_primer
         f=f[:-1]  
         _module_logger.debug("last fragment removed since len(f[%s]) = %s", len(f), last_fragment_length)
     else:
         _module_logger.debug("last fragment stays since len(f[%s]) = %s", len(f),last_fragment_length)
         
-    empty = _Dseqrecord("")    
-    
     _module_logger.debug(f)
     
     _module_logger.debug("loop through fragments in groups of three:")
     
     tail_length = _math.ceil(overlap/2)
+
+    seqs = [item.seq.todata for item in f]
     
     for i in range(len(f)-1):
 
         first  = f[i] 
         secnd  = f[i+1]
 
-        secnd_len = len(secnd)
+        first_seq = seqs[i]
+        secnd_seq = seqs[i+1]
+
+        secnd_len = len(secnd_seq)
      
-        _module_logger.debug( "first = %s", str(first.seq))
-        _module_logger.debug( "secnd = %s", str(secnd.seq))
+        _module_logger.debug( "first = %s", first_seq)
+        _module_logger.debug( "secnd = %s", secnd_seq)
         
         if secnd_len <= maxlink:  
             _module_logger.debug("secnd is smaller or equal to maxlink; should be added to primer(s)")
             third  = f[i+2]
-            _module_logger.debug( "third = %s", str(third.seq))
+            third_seq = seqs[i+2]
+            _module_logger.debug( "third = %s", third_seq)
             if hasattr(f[i], "template") and hasattr(third, "template"):
                 _module_logger.debug("secnd is is flanked by amplicons, so half of secnd should be added each flanking primers")
                 
-                first.reverse_primer = secnd.seq.rc().todata[secnd_len//2:] + first.reverse_primer
-                third.forward_primer =      secnd.seq.todata[secnd_len//2:] + third.forward_primer
+                first.reverse_primer = _rc(secnd_seq)[secnd_len//2:] + first.reverse_primer
+                third.forward_primer =      secnd_seq[secnd_len//2:] + third.forward_primer
                 
-                lnk = (third.seq.rc().todata+secnd.rc().seq.todata[:secnd_len//2])[-tail_length:]
+                lnk = (_rc(third_seq[:tail_length])+_rc(secnd_seq)[:secnd_len//2])[-tail_length:]
                 _module_logger.debug("1 %s", lnk)
                 first.reverse_primer = lnk + first.reverse_primer
                 
-                lnk =  (first.seq.todata + secnd.seq.todata[:secnd_len//2])[-tail_length:]
+                lnk =  (first_seq[-tail_length:] + secnd_seq[:secnd_len//2])[-tail_length:]
                 _module_logger.debug("2 %s", lnk)
                 third.forward_primer = lnk + third.forward_primer                
                 
             elif hasattr(first , "template"):
-                first.reverse_primer = secnd.seq.rc().todata + first.reverse_primer
-                lnk = str(third.seq[:overlap].rc())
+                first.reverse_primer = _rc(secnd_seq) + first.reverse_primer
+                lnk = _rc(third_seq[:overlap])
                 first.reverse_primer = lnk + first.reverse_primer
             elif hasattr(third , "template"):
-               third.forward_primer = secnd.seq.todata + third.forward_primer
-               lnk = str(first.seq[-overlap:])
+               third.forward_primer = secnd_seq + third.forward_primer
+               lnk = first_seq[-overlap:]
                third.forward_primer = lnk + third.forward_primer
-            secnd=empty
+            secnd=_empty
+            seqs[i+1] = ""
             f[i+2] = third
         else:                    # secnd is larger than maxlink
             if hasattr(first, "template") and hasattr(secnd, "template"):
-                lnk = str(first.seq[-tail_length:])
+                lnk = first_seq[-tail_length:]
                 #_module_logger.debug("4 %s", lnk)
                 secnd.forward_primer = lnk + secnd.forward_primer
-                lnk = str(secnd.seq[:tail_length].rc())
+                lnk = _rc(secnd_seq[:tail_length])
                 #_module_logger.debug("5 %s", lnk)
                 first.reverse_primer = lnk + first.reverse_primer            
             elif hasattr(first , "template"):
-                lnk = str(secnd.seq[:overlap].rc())
+                lnk = _rc(secnd_seq[:overlap])
                 #_module_logger.debug("6 %s", lnk)
                 first.reverse_primer = lnk + first.reverse_primer                
             elif hasattr(secnd , "template"):
-                lnk = str(first.seq[-overlap:])
+                lnk = first_seq[-overlap:]
                 #_module_logger.debug("7 %s", lnk)
                 secnd.forward_primer = lnk + secnd.forward_primer
         f[i]   = first
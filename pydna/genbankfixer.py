@@ -3,7 +3,7 @@
 # doctest: +NORMALIZE_WHITESPACE
 # doctest: +SKIP
 '''This module provides a way to clean up broken Genbank files enough to pass the BioPython Genbank parser
-This parser is based on pyparsing.
+The LOCUS line is parsed with pyparsing, the rest of each record is read by a line based scanner.
 Almost all of this code was lifted from BioJSON (https://github.com/levskaya/BioJSON) by Anselm Levskaya.
 The code put up was not accompanied by any software licence.
 
@@ -18,6 +18,7 @@ which is the formatted genbank string.
 '''
 
 
+import io        as _io
 import re        as _re
 import pyparsing as _pp
 
@@ -64,19 +65,9 @@ LocusEntry = (GoodLocus|BrokenLocus1|BrokenLocus2|BrokenLocus3)
 # (Though these entries are generally useless when it comes to hacking on DNA)
 
 # All entries in a genbank file headed by an all-caps title with no space between start-of-line and title
-CapWord = _pp.Word("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 # after titled line, all subsequent lines have to have at least one space in front of them
 # this is how we split up the genbank record
-SpacedLine =  _pp.White(min=1) + _pp.CharsNotIn("\n") + _pp.LineEnd()
-#HeaderLine = CapWord + CharsNotIn("\n") + LineEnd()
-GenericEntry =  _pp.Group(CapWord + _pp.Combine(_pp.CharsNotIn("\n") + _pp.LineEnd() +\
-                             _pp.ZeroOrMore(SpacedLine ))).setResultsName("generics",listAllMatches=True)
-
-
-#===============================================================================
-# Definition Entry
-#SuppressedSpacedLine =  Suppress(White(min=1)) + CharsNotIn("\n") + LineEnd()
-#DefinitionEntry =  Suppress(Literal("DEFINITION")) + Combine(CharsNotIn("\n") + LineEnd() + ZeroOrMore( SuppressedSpacedLine ))
+CapWord = _re.compile(r"([A-Z]+)\s*(.*)")
 
 #===============================================================================
 # GenBank Feature Table Parser
@@ -102,91 +93,210 @@ GenericEntry =  _pp.Group(CapWord + _pp.Combine(_pp.CharsNotIn("\n") + _pp.LineE
 #
 # if you don't know where something is, don't use it or guess and move on
 
-LPAREN = _pp.Suppress("(")
-RPAREN = _pp.Suppress(")")
-SEP = _pp.Suppress(_pp.Literal(".."))
-
 #recognize numbers w. < & > uncertainty specs, then strip the <> chars to make it fixed
-gbIndex = _pp.Word(_pp.nums+"<>").setParseAction(lambda s,l,t: int(t[0].replace("<","").replace(">","")) )
-SimpleSlice=_pp.Group(gbIndex + SEP + gbIndex) | _pp.Group(gbIndex).setParseAction(lambda s,l,t: [[t[0][0],t[0][0]]])
-
-#recursive def for nested function syntax:  f( g(), g() )
-complexSlice = _pp.Forward()
-complexSlice << (_pp.Literal("complement") | _pp.Literal("join")) + LPAREN + ( _pp.delimitedList(complexSlice) | _pp.delimitedList(SimpleSlice) ) + RPAREN 
-featLocation = _pp.Group( SimpleSlice | complexSlice)
+#a slice is N1..N2 or a single position N, functions are complement( and join( closed by )
+LocationToken = _re.compile(r"(complement|join)\(|(\))|(,)|[<>]*(\d+)[<>]*(?:\.\.[<>]*(\d+)[<>]*)?|(.)")
 
-def parseGBLoc(s,l,t):
-    """retwingles parsed genbank location strings, assumes no joins of RC and FWD sequences """
+def parseGBLoc(s):
+    """retwingles genbank location strings, assumes no joins of RC and FWD sequences """
     strand = 1
     locationlist=[]
-    
-    #see if there are any complement operators
-    for entry in t[0]:
-        if entry=="complement": strand=-1
+    depth = 0
+
+    for m in LocationToken.finditer(s.replace(" ", "")):
+        function, rparen, comma, start, end, other = m.groups()
+        if function:
+            #see if there are any complement operators
+            if function=="complement": strand=-1
+            depth+=1
+        elif rparen:
+            depth-=1
+        elif start:
+            locationlist.append([int(start), int(end or start)])
+        if other or depth<0 or (comma and not depth):
+            raise ValueError("Could not parse location {}".format(s))
+    if depth or not locationlist:
+        raise ValueError("Could not parse location {}".format(s))
 
-    for entry in t[0]:
-        if type(entry)!=type("string"):
-            locationlist.append([entry[0],entry[1]])
-            
     #return locationlist and strand spec
     return [ ['location', locationlist ], ['strand',strand] ]
 
-featLocation.setParseAction(parseGBLoc)
-
 #==== Genbank Feature Key-Value Pairs
-def strip_multiline(s,l,t):
-    whitespace=_re.compile("[\n]{1}[ ]+")
-    return whitespace.sub(" ",t[0])
-def toInt(s,l,t):
-    return int(t[0])
-
-# Quoted KeyVal:   /key="value"
-QuoteFeaturekeyval = _pp.Group(_pp.Suppress('/') + _pp.Word(_pp.alphas+_pp.nums+"_-") + _pp.Suppress('=') + _pp.QuotedString('"',multiline=True).setParseAction( strip_multiline ) )
-
-# UnQuoted KeyVal: /key=value  (I'm assuming it doesn't do multilines this way? wrong! ApE does store long labels this way! sigh.)
-#NoQuoteFeaturekeyval = Group(Suppress('/') + Word(alphas+nums+"_-") + Suppress('=') + OneOrMore(CharsNotIn("\n")) )
-keyvalspacedline = _pp.White(exact=21)+_pp.CharsNotIn("/")+_pp.OneOrMore(_pp.CharsNotIn("\n"))+_pp.LineEnd()
-NoQuoteFeaturekeyval = _pp.Group(_pp.Suppress('/') + _pp.Word(_pp.alphas+_pp.nums+"_-") + _pp.Suppress('=') + _pp.Combine(_pp.CharsNotIn("\n") + _pp.LineEnd() + _pp.ZeroOrMore( keyvalspacedline )))
-
-# Special Case for Numerical Vals:  /bases=12  OR  /bases="12"
-NumFeaturekeyval = _pp.Group( _pp.Suppress('/') + _pp.Word(_pp.alphas+_pp.nums+"_-") + _pp.Suppress('=') +\
-                         (_pp.Suppress("\"") + _pp.Word(_pp.nums).setParseAction(toInt) + _pp.Suppress("\"") ) | \
-                         (_pp.Word(_pp.nums).setParseAction(toInt) ) \
-                         )
-
-# Key Only KeyVal: /pseudo
-# post-parse convert it into a pair to resemble the structure of the first three cases i.e. [pseudo, True]
-FlagFeaturekeyval = _pp.Group(_pp.Suppress('/') + _pp.Word(_pp.alphas+_pp.nums+"_-")).setParseAction(lambda s,l,t: [[t[0][0],True]] )
-
-Feature = _pp.Group( _pp.Word(_pp.alphas+_pp.nums+"_-").setParseAction(lambda s,l,t: [ ["type", t[0]] ] ) +\
-                 featLocation.setResultsName("location") +\
-                 _pp.OneOrMore( NumFeaturekeyval | QuoteFeaturekeyval | NoQuoteFeaturekeyval | FlagFeaturekeyval ) \
-                 )
-
-FeaturesEntry = _pp.Literal("FEATURES") + _pp.Literal("Location/Qualifiers") + _pp.Group(_pp.OneOrMore(Feature)).setResultsName("features")
+MultilineWhitespace = _re.compile("[\n]{1}[ \t]+")
+
+def strip_multiline(s):
+    return MultilineWhitespace.sub(" ",s)
+
+# /key="value", /key=value or the key only /pseudo
+# Quoted values may span several lines, unquoted values continue on lines indented by exactly 21 spaces
+# (ApE does store long labels this way! sigh.)
+Featurekeyval = _re.compile(r"/([A-Za-z0-9_-]+)(?:=(.*))?")
+Numval = _re.compile(r"[0-9]+")
+
+# the text of a quoted value up to and including its closing quote, "" is an escaped quote
+ClosingQuote = _re.compile(r'(?:[^"]|"")*"(?!")')
+
+def _opens_quoted_value(line):
+    m = Featurekeyval.match(line.lstrip())
+    return bool(m) and (m.group(2) or "").lstrip().startswith('"')
+
+def _feature_qualifier(lines, i, m):
+    """returns the [key, value] pair starting at lines[i], the index of its last line
+    and the rest of that line after a closing quote"""
+    key, val = m.groups()
+    # Key Only KeyVal: /pseudo
+    # convert it into a pair to resemble the structure of the other cases i.e. [pseudo, True]
+    if val is None:
+        return [key, True], i, ""
+    val = val.lstrip()
+    # Quoted KeyVal:   /key="value"
+    if val.startswith('"'):
+        parts = [val[1:]]
+        closing = ClosingQuote.match(parts[0])
+        # the closing quote may be on any following line whatever its indentation, and that
+        # line may look like a qualifier (/data/plasmids ...). Look for it up to the next
+        # section or the next quoted qualifier.
+        j = i
+        while not closing and j+1 < len(lines):
+            nxt = lines[j+1]
+            if nxt[:1].strip() or _opens_quoted_value(nxt):
+                break
+            j += 1
+            parts.append(nxt)
+            closing = ClosingQuote.match(nxt)
+        if closing:
+            i = j
+            rest = parts[-1][closing.end():]
+            parts[-1] = parts[-1][:closing.end()-1]
+        else:
+            # a missing closing quote ends at the next qualifier or feature
+            del parts[1:]
+            while i+1 < len(lines):
+                nxt = lines[i+1]
+                if nxt[:21].strip() or Featurekeyval.match(nxt.lstrip()):
+                    break
+                i += 1
+                parts.append(nxt)
+            rest = ""
+        val = "\n".join(parts).replace('""', '"')
+        # Special Case for Numerical Vals:  /bases="12"
+        if Numval.fullmatch(val.strip()):
+            return [key, int(val)], i, rest
+        return [key, strip_multiline(val)], i, rest
+    # UnQuoted KeyVal: /key=value
+    parts = [val+"\n"]
+    while i+1 < len(lines):
+        nxt = lines[i+1]
+        if nxt[:21].strip() or not nxt[21:].strip() or nxt.lstrip().startswith("/"):
+            break
+        parts.append(nxt+"\n")
+        i += 1
+    return [key, "".join(parts)], i, ""
+
+def _feature_table(lines, i, features):
+    """scans the feature table starting at lines[i], returns the index of the first line after it"""
+    feature = None
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped and not line[0].isspace():
+            break
+        m = Featurekeyval.match(stripped)
+        if m and feature is not None:
+            # more qualifiers may follow a closing quote on the same line
+            while m:
+                pair, i, rest = _feature_qualifier(lines, i, m)
+                feature.append(pair)
+                m = Featurekeyval.match(rest.strip())
+        elif line[:21].strip():
+            # feature key followed by a location that may be wrapped over several lines
+            ftype, *loc = stripped.split(None, 1)
+            loc = "".join(loc)
+            while (not loc or loc.count("(") > loc.count(")") or loc.endswith(",")) and i+1 < len(lines):
+                i += 1
+                loc += lines[i].strip()
+            feature = [["type", ftype]] + parseGBLoc(loc)
+            features.append(feature)
+        i += 1
+    return i
 
 #===============================================================================
 # GenBank Sequence Parser
 
-# sequence is just a column-spaced big table of dna nucleotides
-# should it recognize full IUPAC alphabet?  NCBI uses n for unknown region
-Sequence = _pp.OneOrMore(_pp.Suppress(_pp.Word(_pp.nums)) + _pp.OneOrMore(_pp.Word("ACGTacgtNn")))
+# sequence is just a column-spaced big table of dna nucleotides preceded by position numbers
+# only the IUPAC nucleotide codes are kept, position numbers, whitespace and any junk are deleted
+class _NucleotideTable(dict):
+    def __missing__(self, key):
+        self[key] = None
+        return None
 
-# Group(  ) hides the setResultsName names def'd inside, such that one needs to first access this group and then access the dict of contents inside
-SequenceEntry = _pp.Suppress(_pp.Literal("ORIGIN")) + Sequence.setParseAction(lambda s,l,t: "".join(t) ).setResultsName("sequence")
+Nucleotides = _NucleotideTable((ord(c), ord(c)) for c in "ACGTRYKMSWBDHVNacgtrykmswbdhvn")
 
+# a title like LOCUS or DEFINITION at the start of a line ends the sequence of a record missing its //
+# sequence lines may be unindented, so the title has to contain a letter that is not a nucleotide code
+SectionTitle = _re.compile(r"[A-Z]*[EFIJLOPQXZ][A-Z]*(?:\s|$)")
+
+def _sequence(lines, i, chunks):
+    """collects the sequence following ORIGIN, returns the index of the terminating // line
+    or of the next title line if the record is missing its //"""
+    end = next((j for j in range(i, len(lines))
+                if lines[j].lstrip().startswith("//") or SectionTitle.match(lines[j])), len(lines))
+    chunks.append("".join(lines[i:end]).translate(Nucleotides))
+    return end
 
 #===============================================================================
 # Final GenBank Parser
 
-#GB files with multiple records split by "//" sequence at beginning of line
-GBEnd = _pp.Literal("//")
+def parse_records(gbkstring):
+    """Line based scanner for one or more GenBank records.
 
-#Begin w. LOCUS, slurp all entries, then stop at the end!
-GB = LocusEntry + _pp.OneOrMore(FeaturesEntry | SequenceEntry | GenericEntry) + GBEnd
+    Each record begins with a LOCUS line, which is parsed by LocusEntry to
+    accept the malformed variants above, followed by generic entries, a
+    FEATURES table and an ORIGIN sequence block. GB files with multiple
+    records are split by "//" at the beginning of a line.
 
-#NCBI often returns sets of GB files
-multipleGB = _pp.OneOrMore(_pp.Group(GB))
+    Returns a list with one dict per record holding the LOCUS fields
+    and the "generics", "features" and "sequence" entries.
+    """
+    lines = gbkstring.splitlines()
+    records = []
+    i = 0
+    while i < len(lines):
+        if not lines[i].startswith("LOCUS"):
+            i += 1
+            continue
+
+        locus = LocusEntry.parseString(lines[i])
+        record = { key: locus[key] for key in ("name","size","seqtype","topology","divcode","date") }
+        generics, features, chunks = [], [], []
+        i += 1
+
+        #Begin w. LOCUS, slurp all entries, then stop at the end!
+        while i < len(lines) and not lines[i].lstrip().startswith("//") and not lines[i].startswith("LOCUS"):
+            line = lines[i]
+            m = CapWord.match(line)
+            if not m:
+                i += 1
+            elif m.group(1) == "FEATURES":
+                i = _feature_table(lines, i+1, features)
+            elif m.group(1) == "ORIGIN":
+                i = _sequence(lines, i+1, chunks)
+            else:
+                entry = [m.group(1), m.group(2)+"\n"]
+                i += 1
+                while i < len(lines) and lines[i][:1].isspace():
+                    entry[1] += lines[i]+"\n"
+                    i += 1
+                # an empty title line is continued on the next line
+                if not m.group(2):
+                    entry[1] = entry[1].lstrip()
+                generics.append(entry)
+
+        record["generics"] = generics
+        record["features"] = features
+        record["sequence"] = "".join(chunks)
+        records.append(record)
+    return records
 
 #===============================================================================
 # End Genbank Parser
@@ -196,25 +306,23 @@ multipleGB = _pp.OneOrMore(_pp.Group(GB))
 #===============================================================================
 # Main JSON Conversion Routine
 
-def strip_indent(str):
-    whitespace=_re.compile("[\n]{1}(COMMENT){0,1}[ ]+")
-    return whitespace.sub("\n",str)
+IndentWhitespace = _re.compile("[\n]{1}(COMMENT){0,1}[ ]+")
+
+def strip_indent(s):
+    return IndentWhitespace.sub("\n",s)
 
 def concat_dict(dlist):
     """more or less dict(list of string pairs) but merges
     vals with the same keys so no duplicates occur
     """
     newdict={}
-    for e in dlist:
-        if e[0] in newdict.keys():
-            newdict[e[0]]=(newdict[e[0]]+strip_indent(e[1]))
-        else:
-            newdict[e[0]]=strip_indent(e[1])
-    return newdict
+    for key, val in dlist:
+        newdict.setdefault(key, []).append(strip_indent(val))
+    return { key: "".join(vals) for key, vals in newdict.items() }
 
 def toJSON(gbkstring):
     
-    parsed = multipleGB.parseString(gbkstring)
+    parsed = parse_records(gbkstring)
     
     jseqlist=[]
 
@@ -231,17 +339,8 @@ def toJSON(gbkstring):
         
         #build JSON object
         
-        nl=[]
-        
-        for a in list(map(dict, seq['features'].asList())):
-            dct={}
-            for key in a:
-                val=a[key]
-                #print(key, a[key])
-                dct[key]=a[key]
-                if isinstance(val, str):
-                    dct[key]=a[key].strip()
-            nl.append(dct)
+        nl=[ { key: (val.strip() if isinstance(val, str) else val) for key, val in feature }
+             for feature in seq['features'] ]
             
         #import sys;sys.exit(42)    
         
@@ -262,71 +361,74 @@ def toJSON(gbkstring):
 
     return jseqlist
 
-def wrapstring(str_, rowstart, rowend, padfirst=True):
+# left padding for wrapstring is sliced from here
+Spaces = " "*128
+
+def wrapstring(s, rowstart, rowend, padfirst=True):
     """
     wraps the provided string in lines of length rowend-rowstart
     and padded on the left by rowstart.
     -> if padfirst is false the first line is not padded
     """
     rowlen  = rowend-rowstart
-    leftpad = rowstart
-    wrappedstr=""
+    leftpad = Spaces[:rowstart] if rowstart <= len(Spaces) else " "*rowstart
 
     #no wrapping needed, single line
-    if len(str_)/rowlen < 1:
-        if padfirst:
-            return leftpad*" "+str_+"\n"
-        else:
-            return str_+"\n"
-        
+    if len(s) <= rowlen:
+        return (leftpad if padfirst else "")+s+"\n"
+
     #multiple lines so wrap:
-    for linenum in range(1+int(len(str_)/rowlen)):
-        if linenum==0 and not padfirst:
-            wrappedstr+= str[linenum*rowlen:(linenum+1)*rowlen]+"\n"
-        else:
-            wrappedstr+=" "*leftpad + str_[linenum*rowlen:(linenum+1)*rowlen]+"\n"
-#    if str_.startswith("/translation="):
-#        print(str_)
-#        print(wrappedstr)
-#        print(".................................")
-    return wrappedstr
+    lines = [s[pos:pos+rowlen] for pos in range(0, len(s), rowlen)]
+    if not padfirst:
+        return lines[0]+"\n"+"".join(leftpad+line+"\n" for line in lines[1:])
+    return "".join(leftpad+line+"\n" for line in lines)
 
 def locstr(locs,strand):
     "genbank formatted location string, assumes no join'd combo of rev and fwd seqs"
     # slice format is like: 1..10,20..30,101..200
-    locstr=",".join(map((lambda x: str(x[0])+".."+str(x[1])), locs))
+    locstr=",".join("{}..{}".format(start, end) for start, end in locs)
     if len(locs)>1:
         locstr=("join("+locstr+")")
-    if int(strand)==-1:
-        locstr=("complement("+locstr+")")
+    if strand==-1:
+        return "complement({})".format(locstr)
     return locstr
 
-def originstr(sequence):
-    "formats dna sequence as broken, numbered lines ala genbank"
+def originchunks(sequence, rows=1000):
+    "yields the formatted dna sequence of originstr in pieces of at most rows lines"
     wordlen=10
     cols=6
     rowlen=wordlen*cols
-    outstr=""
-    for linenum in range( int(len(sequence)/rowlen)+1):
-        pos=linenum*rowlen
-        #position of string for this row, then six blocks of dna
-        outstr+=(" "*9+str(pos+1))[-9:] + " " + \
-           sequence[pos:pos+10]+" "+\
-           sequence[pos+10:pos+20]+" "+\
-           sequence[pos+20:pos+30]+" "+\
-           sequence[pos+30:pos+40]+" "+\
-           sequence[pos+40:pos+50]+" "+\
-           sequence[pos+50:pos+60]+"\n"
-    return outstr
+    chunklen=rowlen*rows
+    for start in range(0, len(sequence)+1, chunklen):
+        chunk=sequence[start:start+chunklen]
+        #six blocks of dna per row, preceded by the position of the row
+        blocks=[chunk[pos:pos+wordlen] for pos in range(0, len(chunk), wordlen)]
+        lines=list(map(" ".join, zip(*[iter(blocks)]*cols)))
+        #the last row of the sequence is partial or empty
+        if start+chunklen > len(sequence):
+            lines.append(" ".join(blocks[len(lines)*cols:]))
+        yield "".join(map("{:>9} {}\n".format, range(start+1, start+len(chunk)+2, rowlen), lines))
+
+def originstr(sequence):
+    "formats dna sequence as broken, numbered lines ala genbank"
+    return "".join(originchunks(sequence))
+
+# feature keys written on the location line rather than as qualifiers
+LocationKeys = frozenset(("type","location","strand"))
+# qualifiers that ApE writes without quotation marks
+UnquotedKeys = frozenset(("ApEinfo_label","ApEinfo_fwdcolor","ApEinfo_revcolor","label"))
 
 def toGB(jseqs):
     "parses json jseq data and prints out ApE compatible genbank"
+    buf = _io.StringIO()
+    toGB_write(jseqs, buf)
+    return buf.getvalue()
+
+def toGB_write(jseqs, fp):
+    "writes json jseq data as ApE compatible genbank to the file object fp"
 
     #take first jseq from parsed list
-    if type(jseqs)==type([]):
-        jseq=jseqs[0]
-    else:
-        jseq=jseqs
+    jseq = jseqs[0] if isinstance(jseqs, list) else jseqs
     
     #construct the LOCUS header string
     #  LOCUS format: 
@@ -351,14 +453,12 @@ def toGB(jseqs):
     name    = jseq["name"] or "default"
     size    = jseq["size"] or "100"
     seqtype = jseq["seqtype"] or "DNA"
-    prefix = ""
-    for p in ["ds-", "ss-", "ms-"]:
-        a, *b = seqtype.split(p)
-        if b: 
+    prefix  = "ds-"
+    for p in ("ds-", "ss-", "ms-"):
+        if seqtype.startswith(p):
             prefix=p
-            seqtype=b.pop()
+            seqtype=seqtype[len(p):]
             break
-    prefix  = prefix or "ds-"    
     topology = jseq["topology"] or "linear"
     divcode  = jseq["divcode"] or "   "
     date = jseq["date"] or "19-MAR-1970"
@@ -381,29 +481,28 @@ def toGB(jseqs):
               "COMMENT     ApEinfo:methylated:1\n"+\
               "FEATURES             Location/Qualifiers\n"
 
-    #build the feature table
-    featuresstr=""
+    fp.write(locusstr)
+    fp.write(gbprops)
+
+    #write the feature table
     for feat in jseq["features"]:
-        fstr= " "*5 + feat["type"] +\
-              " "*(16-len(feat["type"])) + \
-              wrapstring(locstr(feat["location"],feat["strand"]),21,80,False)
-        for k in feat.keys():
-            if k not in ["type","location","strand"]:
-                #ApE idiosyncrasy: don't wrap val in quotation marks
-                if k in ["ApEinfo_label","ApEinfo_fwdcolor","ApEinfo_revcolor","label"]:
-                    fstr+=wrapstring("/"+str(k)+"="+str(feat[k]),21,80)
-                #standard: wrap val in quotes
-                else:
-                    fstr+=wrapstring("/"+str(k)+"="+"\""+str(feat[k])+"\"",21,80)
-        featuresstr+=fstr
+        fp.write("     {:<16}".format(feat["type"]) +
+                 wrapstring(locstr(feat["location"],feat["strand"]),21,80,False))
+        for k, v in feat.items():
+            if k in LocationKeys:
+                continue
+            #ApE idiosyncrasy: don't wrap val in quotation marks
+            if k in UnquotedKeys:
+                fp.write(wrapstring("/"+str(k)+"="+str(v),21,80))
+            #standard: wrap val in quotes
+            else:
+                fp.write(wrapstring("/"+str(k)+"="+"\""+str(v).replace('"', '""')+"\"",21,80))
 
     #the spaced, numbered sequence
-    gborigin="ORIGIN\n"+\
-              originstr(jseq["sequence"])+\
-              "//\n"
-    
-    return locusstr+gbprops+featuresstr+gborigin
-            
+    fp.write("ORIGIN\n")
+    fp.writelines(originchunks(jseq["sequence"]))
+    fp.write("//\n")
+
 def gbtext_clean(gbtext):
     jseqlist=toJSON(gbtext)
     jseq = jseqlist.pop()
@@ -15,6 +15,9 @@ from Bio.Seq import Seq                           as _Seq
 from Bio.SeqRecord import SeqRecord               as _SeqRecord
 from pydna.tm import tmbresluc                    as _tmbresluc
 
+# alphabets carry no state, so all primers made from strings can share one
+_ambiguous_dna = _IUPACAmbiguousDNA()
+
 class Primer(_SeqRecord):
     '''This class can hold information about a primer and its position on a template 
        footprint and tail.   
@@ -33,22 +36,39 @@ class Primer(_SeqRecord):
         elif hasattr(record, "alphabet"):
             super().__init__(record, *args, **kwargs)            
         else:        
-            super().__init__(_Seq(record, _IUPACAmbiguousDNA()), *args, **kwargs)
+            super().__init__(_Seq(record, _ambiguous_dna), *args, **kwargs)
         self.concentration = concentration           
         self.position      = position
         self._fp           = footprint
         self.template      = template
+        self._footprint    = self.seq[-footprint:] if footprint else ""
+        self._tail         = self.seq[:-footprint] if footprint else ""
+        self._seq_upper    = None
     
+    def __getstate__(self):
+        # the cached strings are left out, so primers pickle as before, tm() does not
+        # change the memorize cache key and primers pickled without them still load
+        state = self.__dict__.copy()
+        for key in ("_footprint", "_tail", "_seq_upper"):
+            state.pop(key, None)
+        return state
+
     @property
     def footprint(self):
-        return self.seq[-self._fp:] if self._fp else ""
+        footprint = self.__dict__.get("_footprint")
+        if footprint is None:
+            footprint = self._footprint = self.seq[-self._fp:] if self._fp else ""
+        return footprint
 
     @property
     def tail(self):
-        return self.seq[:-self._fp] if self._fp else ""
+        tail = self.__dict__.get("_tail")
+        if tail is None:
+            tail = self._tail = self.seq[:-self._fp] if self._fp else ""
+        return tail
 
     def __repr__(self):
-        s = min( (self.seq,"{}..{}".format(self.seq[:15], self.seq[-3:])), key=len)
+        s = self.seq if len(self.seq)<=20 else "{}..{}".format(self.seq[:15], self.seq[-3:])
         return "{id} {len}-mer:5'-{seq}-3'".format(id=self.id,len=len(self),seq=s)
     
     def __radd__(self, other):
@@ -56,7 +76,10 @@ class Primer(_SeqRecord):
         return Primer(new, template = self.template, position=self.position, footprint=self._fp)
     
     def tm(self, saltc=50.0, formula=_tmbresluc):
-        return formula( str(self.seq).upper(), primerc=self.concentration, saltc=saltc )
+        seq_upper = self.__dict__.get("_seq_upper")
+        if seq_upper is None:
+            seq_upper = self._seq_upper = str(self.seq).upper()
+        return formula( seq_upper, primerc=self.concentration, saltc=saltc )
 
 if __name__=="__main__":
     import os as _os
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import math as _math
+from pydna import _thermodynamic_data
+
+# nearest neighbour (dH, dS) pairs for tmbresluc keyed on lower case dinucleotides
+_nnbresluc = { chr(n1+97)+chr(n2+97): (dH, _thermodynamic_data.dSBr[n1][n2])
+               for n1, row in _thermodynamic_data.dHBr.items()
+               for n2, dH in row.items() }
 
 def tmstaluc98(primer,*args, dnac=50, saltc=50, **kwargs):
     '''Returns the melting temperature (Tm) of the primer using
@@ -214,8 +220,6 @@ def tmbresluc(primer, *args, primerc=500.0, saltc=50, thermodynamics=False, **kw
 
     '''
 
-    from . import _thermodynamic_data
-
     saltc = float(saltc)/1000
     pri  = primerc/10E7
     dS = -12.4
@@ -224,10 +228,9 @@ def tmbresluc(primer, *args, primerc=500.0, saltc=50, thermodynamics=False, **kw
     STR = primer.lower();
 
     for i in range(len(STR)-1):
-        n1=ord(STR[i])
-        n2=ord(STR[i+1])
-        dH += _thermodynamic_data.dHBr[n1 - 97][n2 - 97]
-        dS += _thermodynamic_data.dSBr[n1 - 97][n2 - 97]
+        H, S = _nnbresluc[STR[i:i+2]]
+        dH += H
+        dS += S
 
     tm = (dH / (1.9872 * _math.log(pri / 1600) + dS) + (16.6 * _math.log(saltc)) / _math.log(10)) - 273.15
 
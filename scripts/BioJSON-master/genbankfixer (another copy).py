@@ -388,6 +388,11 @@ def toGB(jseqs):
 
 if __name__ == "__main__":
     import os
+    import io
+    import textwrap
+    from Bio import SeqIO
+    from Bio.Alphabet.IUPAC     import IUPACAmbiguousDNA
+    pattern = re.compile(r"(?:>.+\n^(?:^[^>]+?)(?=\n\n|>|LOCUS|ID))|(?:(?:LOCUS|ID)(?:(?:.|\n)+?)^//)", flags=re.MULTILINE)
     for file in ( f for f in os.listdir("testfiles") if not f.startswith(".") ):
         with open("testfiles/"+file, "r") as f:
             infile = f.read()
@@ -411,16 +416,10 @@ if __name__ == "__main__":
     
             item = gbstr
             raw=""
-            import textwrap
             raw+=textwrap.dedent(item).strip()
-            pattern =  r"(?:>.+\n^(?:^[^>]+?)(?=\n\n|>|LOCUS|ID))|(?:(?:LOCUS|ID)(?:(?:.|\n)+?)^//)"
-            import re
-            rawseqs = re.findall(pattern, textwrap.dedent(raw + "\n\n"), flags=re.MULTILINE)
+            rawseqs = pattern.findall(textwrap.dedent(raw + "\n\n"))
             rawseq = rawseqs.pop(0)
-            import io
             handle = io.StringIO(rawseq)
-            from Bio import SeqIO
-            from Bio.Alphabet.IUPAC     import IUPACAmbiguousDNA
             parsed = SeqIO.read(handle, "genbank", alphabet=IUPACAmbiguousDNA())
             #import pydna
             print(repr(pydna.Dseqrecord(parsed)))
@@ -26,5 +26,124 @@ def test_pydna_gbtext_clean():
         #calcseg = pydna.read( pydna.gbtext_clean(infile).gbtext ).seguid()
         #print('"'+calcseg+'"),')
 
+def test_toJSON():
+
+    from pydna.genbankfixer import toJSON
+
+    gbtext = """LOCUS       test           40 bp    DNA     linear       01-JAN-2017
+DEFINITION  a test record
+            with a second line.
+FEATURES             Location/Qualifiers
+     CDS             join(1..10,
+                     21..30)
+                     /codon_start="1"
+                     /label=a long label
+                     /translation="MAAF
+                     MLQ
+     misc_feature    complement(11..20)
+                     /note="not closed
+     misc_feature    31..40
+                     /note="cloned from plasmid pX; see
+                     /data/plasmids for the map"
+ORIGIN
+        1 gatcgatcga tcgatcgatc gatcgatcga tcgatcgatc
+//
+LOCUS       test2           10 bp    DNA     circular       01-JAN-2017
+ORIGIN
+        1 gatcgatcga
+//
+"""
+    first, second = toJSON(gbtext)
+
+    assert first["name"] == "test"
+    assert first["annotations"]["DEFINITION"] == "a test record\nwith a second line.\n"
+    assert len(first["sequence"]) == 40
+    cds, misc, wrapped = first["features"]
+    assert cds["location"] == [[1, 10], [21, 30]]
+    assert cds["strand"] == 1
+    assert cds["codon_start"] == 1
+    assert cds["label"] == "a long label"
+    assert cds["translation"] == "MAAF MLQ"
+    assert misc["strand"] == -1
+    assert misc["note"] == "not closed"
+    assert wrapped["note"] == "cloned from plasmid pX; see /data/plasmids for the map"
+    assert "data" not in wrapped
+
+    assert second["topology"] == "circular"
+    assert second["features"] == []
+    assert second["sequence"] == "gatcgatcga"
+
+def test_toJSON_quoted_values():
+
+    from pydna.genbankfixer import toJSON
+
+    def features(table):
+        gbtext = ("LOCUS       test           10 bp    DNA     linear       01-JAN-2017\n"
+                  "FEATURES             Location/Qualifiers\n"
+                  "     misc_feature    1..10\n" + table +
+                  "ORIGIN\n"
+                  "        1 gatcgatcga\n"
+                  "//\n")
+        feature, = toJSON(gbtext)[0]["features"]
+        return feature
+
+    # continuation lines indented with tabs or by less than 21 spaces
+    tabs = features('\t\t\t/note="abc\n\t\t\tdef"\n\t\t\t/gene="x"\n')
+    assert tabs["note"] == "abc def"
+    assert tabs["gene"] == "x"
+    short = features('                     /note="abc\n          def"\n                     /gene="x"\n')
+    assert short["note"] == "abc def"
+    assert short["gene"] == "x"
+
+    # "" is an escaped quote
+    assert features('                     /note="a ""b"" c"\n')["note"] == 'a "b" c'
+
+    # two qualifiers on one line
+    both = features('                     /note="abc" /gene="x"\n')
+    assert both["note"] == "abc"
+    assert both["gene"] == "x"
+
+def test_toJSON_missing_end_of_record():
+
+    from pydna.genbankfixer import toJSON
+
+    gbtext = """LOCUS       test           10 bp    DNA     linear       01-JAN-2017
+ORIGIN
+        1 gatcgatcga
+LOCUS       test2           10 bp    DNA     circular       01-JAN-2017
+DEFINITION  y.
+ORIGIN
+        1 ttttttttta
+//
+"""
+    first, second = toJSON(gbtext)
+
+    assert first["sequence"] == "gatcgatcga"
+    assert second["name"] == "test2"
+    assert second["annotations"]["DEFINITION"] == "y.\n"
+    assert second["sequence"] == "ttttttttta"
+
+def test_toJSON_sequence():
+
+    from pydna.genbankfixer import toJSON
+
+    gbtext = """LOCUS       test           30 bp    DNA     linear       01-JAN-2017
+ORIGIN
+1 gatcgatcga GATCGATCGA
+11 gatc\xa0gatcga*
+//
+"""
+    record, = toJSON(gbtext)
+
+    assert record["sequence"] == "gatcgatcgaGATCGATCGAgatcgatcga"
+
+def test_wrapstring():
+
+    from pydna.genbankfixer import wrapstring
+
+    assert wrapstring("a"*10, 2, 7) == "  aaaaa\n  aaaaa\n"
+    assert wrapstring("a"*12, 2, 7, False) == "aaaaa\n  aaaaa\n  aa\n"
+    assert wrapstring("a"*4, 2, 7, False) == "aaaa\n"
+
 if __name__ == '__main__':
     pytest.cmdline.main([__file__, "-v", "-s"])
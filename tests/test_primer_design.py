@@ -57,5 +57,22 @@ def test_primer_Design_with_linker():
 
     assert (b+l+c).looped().cseguid() == 'jdHXfQI5k4Sk2ESiZYfKv4oP2FI'
 
+def test_primer_design_short_template():
+    ''' target tm can not be reached on the template '''
+
+    t = Dseqrecord("gattacagattacagatta")
+
+    ampl = primer_design(t)
+
+    assert str(ampl.forward_primer.seq) == "gattacagattacagatta"
+    assert str(ampl.reverse_primer.seq) == "taatctgtaatctgtaatc"
+
+def test_primer_design_template_not_longer_than_limit():
+
+    t = Dseqrecord("gattacagattac")
+
+    with pytest.raises(ValueError):
+        primer_design(t)
+
 if __name__ == '__main__':
     pytest.cmdline.main([__file__, "-v", "-s"])